@@ -1,27 +1,92 @@
+from typing import Dict, Tuple
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from config import PROVINCE_NAME_MAP
 
-@st.cache_data(show_spinner=False)
-def yearly_burned(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return pd.DataFrame(columns=["year", "burned_area"])
-    return df.groupby("year", as_index=False)["burned_area"].sum()
+
+def normalize_province_names(province: pd.Series) -> pd.Series:
+    # Works on the categories, not the rows. Two source spellings may map to
+    # the same name, so row codes are remapped instead of renaming in place
+    # (rename_categories requires the new names to stay unique).
+    renamed = pd.Index([PROVINCE_NAME_MAP.get(name, name) for name in province.cat.categories])
+    categories = renamed.unique()
+    # Trailing -1 keeps missing values (code -1) missing
+    lookup = np.append(categories.get_indexer(renamed), -1)
+    codes = lookup[province.cat.codes.to_numpy()]
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories),
+        index=province.index,
+        name="province_normalized",
+    )
 
 
 @st.cache_data(show_spinner=False)
-def yearly_resources(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return pd.DataFrame(columns=["year", "num_personnel", "num_heavy", "num_air"])
-    return df.groupby("year", as_index=False)[["num_personnel", "num_heavy", "num_air"]].sum()
+def chart_summaries(
+    _df: pd.DataFrame,
+    year_range: Tuple[int, int],
+    include_intentional: bool,
+    include_unintentional: bool,
+    top_n: int = 10,
+) -> Dict[str, pd.DataFrame]:
+    # One groupby per filter key feeds all three charts
+    if _df.empty:
+        by_year = pd.DataFrame(
+            columns=["year", "burned_area", "num_personnel", "num_heavy", "num_air"]
+        )
+        top_provinces = pd.DataFrame(columns=["province", "burned_area"])
+    else:
+        by_year = _df.groupby("year", as_index=False)[
+            ["burned_area", "num_personnel", "num_heavy", "num_air"]
+        ].sum()
+        burned = _df.groupby("province", observed=True)["burned_area"].sum().nlargest(top_n)
+        top_provinces = burned.rename_axis("province").reset_index()
+
+    return {
+        "burned_by_year": by_year[["year", "burned_area"]],
+        "resources_by_year": by_year[["year", "num_personnel", "num_heavy", "num_air"]],
+        "top_provinces": top_provinces,
+    }
 
 
 @st.cache_data(show_spinner=False)
-def top_provinces_by_burned_area(df: pd.DataFrame, top_n: int = 10) -> pd.DataFrame:
-    if df.empty:
-        return pd.DataFrame(columns=["province", "burned_area"])
-    out = df.groupby("province", as_index=False)["burned_area"].sum()
-    return out.sort_values("burned_area", ascending=False).head(top_n)
+def province_resources(
+    _df: pd.DataFrame,
+    year_range: Tuple[int, int],
+    include_intentional: bool,
+    include_unintentional: bool,
+) -> Tuple[pd.DataFrame, Dict[str, Dict]]:
+    if _df.empty:
+        empty = pd.DataFrame(
+            columns=[
+                "province_normalized",
+                "num_personnel",
+                "num_heavy",
+                "num_air",
+                "burned_area",
+                "total_resources",
+            ]
+        )
+        return empty, {}
+
+    province_normalized = normalize_province_names(_df["province"])
+
+    agg = (
+        _df.groupby(province_normalized, observed=True)
+        .agg(
+            num_personnel=("num_personnel", "sum"),
+            num_heavy=("num_heavy", "sum"),
+            num_air=("num_air", "sum"),
+            burned_area=("burned_area", "sum"),
+        )
+        .reset_index()
+    )
+    agg["total_resources"] = agg[["num_personnel", "num_heavy", "num_air"]].sum(axis=1)
+
+    info_by_province = agg.set_index("province_normalized").to_dict(orient="index")
+    return agg, info_by_province
 
 
 @st.cache_data(show_spinner=False)
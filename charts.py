@@ -1,37 +1,79 @@
+import numpy as np
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
+
+MARGIN = dict(l=20, r=20, t=50, b=20)
+
+# Beyond this many points the line is min-max downsampled before it is sent
+# to the browser. Yearly data stays far below it.
+MAX_LINE_POINTS = 2000
+
+RESOURCE_TRACES = {
+    "num_personnel": "Personnel",
+    "num_heavy": "Heavy",
+    "num_air": "Air",
+}
+
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, max_points: int = MAX_LINE_POINTS):
+    """Keep the min and max of y in each equal bin, plus both endpoints."""
+    n = len(y)
+    if n <= max_points:
+        return x, y
+
+    # Two points per bin and the two endpoints stay within max_points
+    n_bins = (max_points - 2) // 2
+    size = -(-n // n_bins)
+    # Pad with the last value so the final, shorter bin reshapes cleanly
+    binned = np.pad(y, (0, n_bins * size - n), mode="edge").reshape(n_bins, size)
+    offsets = np.arange(n_bins) * size
+    idx = np.concatenate(
+        [offsets + binned.argmin(axis=1), offsets + binned.argmax(axis=1), [0, n - 1]]
+    )
+    idx = np.unique(np.minimum(idx, n - 1))
+    return x[idx], y[idx]
 
 
 def create_line_chart(burned_by_year: pd.DataFrame):
     if burned_by_year.empty:
-        return px.line()
+        return go.Figure()
 
-    fig = px.line(
-        burned_by_year,
-        x="year",
-        y="burned_area",
+    x, y = minmax_downsample(
+        burned_by_year["year"].to_numpy(dtype=int),
+        burned_by_year["burned_area"].to_numpy(),
+    )
+    fig = go.Figure(
+        go.Scattergl(
+            x=x,
+            y=y,
+            mode="lines+markers",
+            name="Burned area",
+        )
+    )
+    fig.update_layout(
         title="Burned area (hectares) by year",
-        labels={"year": "Year", "burned_area": "Burned area (ha)"},
-        markers=True,
+        margin=MARGIN,
+        xaxis_title="Year",
+        yaxis_title="Burned area (ha)",
     )
-    fig.update_layout(margin=dict(l=20, r=20, t=50, b=20))
     return fig
 
 
 def create_stacked_bar(resources_by_year: pd.DataFrame):
     if resources_by_year.empty:
-        return px.bar()
+        return go.Figure()
 
-    fig = px.bar(
-        resources_by_year,
-        x="year",
-        y=["num_personnel", "num_heavy", "num_air"],
-        title="Resources used by year",
-        labels={"value": "Count", "year": "Year"},
-        barmode="stack",
+    years = resources_by_year["year"].to_numpy(dtype=int)
+    fig = go.Figure(
+        [
+            go.Bar(x=years, y=resources_by_year[col].to_numpy(), name=name)
+            for col, name in RESOURCE_TRACES.items()
+        ]
     )
     fig.update_layout(
-        margin=dict(l=20, r=20, t=50, b=20),
+        title="Resources used by year",
+        barmode="stack",
+        margin=MARGIN,
         xaxis_title="Year",
         yaxis_title="Count",
         legend_title="Resource type",
@@ -41,19 +83,21 @@ def create_stacked_bar(resources_by_year: pd.DataFrame):
 
 def create_top_provinces_chart(top_provinces: pd.DataFrame):
     if top_provinces.empty:
-        return px.bar()
+        return go.Figure()
 
-    fig = px.bar(
-        top_provinces.sort_values("burned_area", ascending=True),
-        x="burned_area",
-        y="province",
-        orientation="h",
-        title="Top affected provinces",
-        labels={"burned_area": "Burned area (ha)", "province": "Province"},
+    ordered = top_provinces.sort_values("burned_area", ascending=True)
+    fig = go.Figure(
+        go.Bar(
+            x=ordered["burned_area"].to_numpy(),
+            y=ordered["province"].astype(str).to_numpy(),
+            orientation="h",
+            name="Burned area",
+        )
     )
     fig.update_layout(
-        margin=dict(l=20, r=20, t=50, b=20),
+        title="Top affected provinces",
+        margin=MARGIN,
         xaxis_title="Burned area (ha)",
         yaxis_title="Province",
     )
-    return fig
\ No newline at end of file
+    return fig
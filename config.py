@@ -1,6 +1,8 @@
-from typing import Dict
+from types import MappingProxyType
+from typing import Mapping
 
-PROVINCE_NAME_MAP: Dict[str, str] = {
+# Read-only: normalize_province_names looks names up with .get
+PROVINCE_NAME_MAP: Mapping[str, str] = MappingProxyType({
     "Leon": "León",
     "A Coruna": "A Coruña",
     "Bizkaia": "Bizkaia/Vizcaya",
@@ -18,7 +20,6 @@ PROVINCE_NAME_MAP: Dict[str, str] = {
     "Castellon": "Castelló/Castellón",
     "Islas Baleares": "Illes Balears",
     "Santa Cruz de Tenerife": "Santa Cruz De Tenerife",
-}
+})
 
-MAP_CENTER = [40.4168, -3.7038]
 MAP_BOUNDS = [[26.5, -18.5], [44.5, 5.5]]
\ No newline at end of file
@@ -1,29 +1,78 @@
 from pathlib import Path
-from typing import Dict
+from types import MappingProxyType
+from typing import Mapping, Optional
 import json
+import os
+import tempfile
 
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
 
 
-@st.cache_data(show_spinner=False)
-def load_data(filepath: str = "incendios.csv") -> pd.DataFrame:
-    path = Path(filepath)
-    if not path.exists():
-        raise FileNotFoundError(f"Data file not found: {filepath}")
+CSV_COLUMNS = {
+    "provincia": "province",
+    "anio": "year",
+    "perdidassuperficiales": "burned_area",
+    "numeromediospersonal": "num_personnel",
+    "numeromediospesados": "num_heavy",
+    "numeromediosaereos": "num_air",
+    "idcausa": "cause_id",
+}
 
-    df = pd.read_csv(path, sep=";", low_memory=False)
+CSV_CHUNKSIZE = 500_000
 
-    rename_map = {
-        "provincia": "province",
-        "anio": "year",
-        "perdidassuperficiales": "burned_area",
-        "numeromediospersonal": "num_personnel",
-        "numeromediospesados": "num_heavy",
-        "numeromediosaereos": "num_air",
-        "idcausa": "cause_id",
-    }
-    df = df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
+# Bump whenever the cached cube changes its columns or dtypes, so Parquet
+# copies written by older code are ignored instead of reused.
+CACHE_VERSION = 3
+
+# Rows are stored in 32 bits, sums in 64. groupby accumulates in 64 bits but
+# casts the result back to int32/float32 when it fits, so every later sum of
+# the cube would run (and could wrap) in 32 bits without this.
+CUBE_METRICS = {
+    "burned_area": "float64",
+    "num_personnel": "int64",
+    "num_heavy": "int64",
+    "num_air": "int64",
+}
+CUBE_KEYS = ["year", "province", "intentional"]
+
+
+def _cache_path(path: Path) -> Path:
+    return path.with_suffix(f".v{CACHE_VERSION}.parquet")
+
+
+def _read_cache(cache: Path, source: Path) -> Optional[pd.DataFrame]:
+    if not cache.exists() or cache.stat().st_mtime < source.stat().st_mtime:
+        return None
+    try:
+        return pd.read_parquet(cache, engine="pyarrow")
+    except (OSError, ValueError, pa.ArrowException):
+        # Truncated or corrupt copy: parse the CSV again and overwrite it
+        return None
+
+
+def _write_cache(cube: pd.DataFrame, cache: Path) -> None:
+    # Written next to the target and moved into place, so a crash mid-write
+    # never leaves a partial file under the cache name
+    try:
+        fd, tmp = tempfile.mkstemp(dir=cache.parent, prefix=cache.name, suffix=".tmp")
+    except OSError:
+        # Read-only deployments just keep parsing the CSV
+        return
+    os.close(fd)
+    try:
+        cube.to_parquet(tmp, engine="pyarrow", compression="zstd")
+        os.replace(tmp, cache)
+    except OSError:
+        pass
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.rename(columns=CSV_COLUMNS)
 
     defaults = {
         "province": "Unknown",
@@ -38,25 +87,91 @@ def load_data(filepath: str = "incendios.csv") -> pd.DataFrame:
         if col not in df.columns:
             df[col] = default
 
-    df["province"] = df["province"].fillna("Unknown").astype(str)
-    df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
-    df["burned_area"] = pd.to_numeric(df["burned_area"], errors="coerce").fillna(0)
-    df["num_personnel"] = pd.to_numeric(df["num_personnel"], errors="coerce").fillna(0)
-    df["num_heavy"] = pd.to_numeric(df["num_heavy"], errors="coerce").fillna(0)
-    df["num_air"] = pd.to_numeric(df["num_air"], errors="coerce").fillna(0)
-    df["cause_id"] = pd.to_numeric(df["cause_id"], errors="coerce").fillna(0)
+    # Categorical codes keep groupby/map on province cheap in every chart
+    province = df["province"].astype("category")
+    if province.isna().any():
+        if "Unknown" not in province.cat.categories:
+            province = province.cat.add_categories("Unknown")
+        province = province.fillna("Unknown")
+    df["province"] = province
+    df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int32")
+    # 32-bit is plenty for hectares and resource counts and halves the memory
+    df["burned_area"] = (
+        pd.to_numeric(df["burned_area"], errors="coerce").fillna(0).astype("float32")
+    )
+    for col in ("num_personnel", "num_heavy", "num_air"):
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int32")
+    df["cause_id"] = pd.to_numeric(df["cause_id"], errors="coerce").fillna(0).astype("int32")
 
-    # Se calcula una sola vez
-    df["intentional"] = df["cause_id"].between(400, 499)
+    # Computed once, as a plain numpy bool (1 byte/row) rather than pandas'
+    # nullable "boolean"
+    df["intentional"] = df["cause_id"].between(400, 499).to_numpy(dtype=bool)
 
     return df
 
 
+def _sum_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    return df.groupby(CUBE_KEYS, observed=True)[list(CUBE_METRICS)].sum().reset_index()
+
+
+def _parse_cube(path: Path) -> pd.DataFrame:
+    # Parse, downcast and sum one chunk at a time, so only a single chunk of
+    # rows is ever held; the partial sums are combined at the end. Only the
+    # used columns are read; a callable keeps missing ones optional.
+    with pd.read_csv(
+        path,
+        sep=";",
+        usecols=lambda col: col in CSV_COLUMNS,
+        dtype={"provincia": "category"},
+        chunksize=CSV_CHUNKSIZE,
+    ) as reader:
+        partials = [_sum_chunk(_clean_chunk(chunk)) for chunk in reader]
+
+    if not partials:
+        partials = [_sum_chunk(_clean_chunk(pd.DataFrame(columns=list(CSV_COLUMNS))))]
+
+    # Each chunk infers its own provinces, so they concat as plain strings
+    # and become categorical again before the final sum. Missing years are
+    # already gone, so year fits a plain int32 (as it reads back from Parquet).
+    combined = pd.concat(partials, ignore_index=True)
+    combined["province"] = combined["province"].astype(str).astype("category")
+    combined["year"] = combined["year"].astype("int32")
+    return combined.groupby(CUBE_KEYS, observed=True)[list(CUBE_METRICS)].sum()
+
+
 @st.cache_data(show_spinner=False)
-def load_geojson(filepath: str = "spain-provinces.geojson") -> Dict:
+def load_cube(filepath: str = "incendios.csv") -> pd.DataFrame:
+    # year x province x intentional sums; every filter and chart reads this
+    # small frame instead of the row-level data, which is never built in
+    # full. Rows without a year drop out here, as they did in filter_data.
+    path = Path(filepath)
+    if not path.exists():
+        raise FileNotFoundError(f"Data file not found: {filepath}")
+
+    # The cube is also kept as a Parquet copy; survives process restarts
+    cache = _cache_path(path)
+    cube = _read_cache(cache, path)
+    if cube is None:
+        cube = _parse_cube(path).astype(CUBE_METRICS)
+        _write_cache(cube, cache)
+    return cube
+
+
+@st.cache_resource(show_spinner=False)
+def load_geojson(filepath: str = "spain-provinces.min.geojson") -> Mapping:
+    # The default file is produced by simplify_geojson.py. Kept as a shared
+    # resource: cache_data would unpickle a fresh copy of every coordinate
+    # on each rerun. Consumers build new dicts and never mutate it.
     path = Path(filepath)
     if not path.exists():
         raise FileNotFoundError(f"GeoJSON file not found: {filepath}")
 
     with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
\ No newline at end of file
+        geojson = json.load(f)
+
+    # Anything else in properties would only bloat the map payload
+    for feature in geojson.get("features", []):
+        props = feature.get("properties", {})
+        feature["properties"] = {k: props[k] for k in ("name", "cod_prov") if k in props}
+
+    return MappingProxyType(geojson)
\ No newline at end of file
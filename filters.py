@@ -1,29 +1,34 @@
 from typing import Tuple
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 
 @st.cache_data(show_spinner=False)
 def filter_data(
-    df: pd.DataFrame,
+    _cube: pd.DataFrame,
     year_range: Tuple[int, int],
     include_intentional: bool,
     include_unintentional: bool,
 ) -> pd.DataFrame:
-    if df.empty:
-        return df.copy()
-
-    if not include_intentional and not include_unintentional:
-        return df.iloc[0:0].copy()
+    # Underscored arguments are not hashed by st.cache_data. `_cube` is the
+    # cached output of load_cube, so the filter inputs alone key the result;
+    # chart_summaries, province_resources and choropleth_geojson take this
+    # slice (or data derived from it) the same way. The slice is returned
+    # flat, with year/province/intentional as columns.
+    if _cube.empty or (not include_intentional and not include_unintentional):
+        return _cube.iloc[0:0].reset_index()
 
     min_year, max_year = year_range
 
-    out = df.loc[df["year"].notna()].copy()
-    out = out[(out["year"] >= min_year) & (out["year"] <= max_year)]
+    # Plain numpy masks over the index levels; no .loc alignment or copies
+    years = _cube.index.get_level_values("year").to_numpy(dtype="int32")
+    mask = (years >= min_year) & (years <= max_year)
 
-    if include_intentional and not include_unintentional:
-        out = out[out["intentional"]]
-    elif include_unintentional and not include_intentional:
-        out = out[~out["intentional"]]
+    intentional = _cube.index.get_level_values("intentional").to_numpy(dtype=bool)
+    if not include_intentional:
+        mask &= ~intentional
+    if not include_unintentional:
+        mask &= intentional
 
-    return out
\ No newline at end of file
+    return _cube.iloc[np.flatnonzero(mask)].reset_index()
\ No newline at end of file
@@ -1,109 +1,143 @@
-import copy
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional, Tuple
+import json
 
-import folium
 from branca.colormap import linear
-from folium.features import GeoJsonTooltip
-from folium.plugins import Fullscreen
 import pandas as pd
+import pydeck as pdk
+from pydeck.bindings.json_tools import default_serialize
+import streamlit as st
+
+from aggregations import province_resources
+from config import MAP_BOUNDS
+
+# Per-feature colours are plain RGB; the layer applies the transparency
+NO_DATA_COLOR = [242, 242, 242]
+FILL_OPACITY = 0.75
+
+TOOLTIP_HTML = (
+    "<b>{name}</b><br/>"
+    "Total resources: {total_resources}<br/>"
+    "Personnel: {num_personnel}<br/>"
+    "Heavy: {num_heavy}<br/>"
+    "Air: {num_air}<br/>"
+    "Burned area (ha): {burned_area}"
+)
+
+
+@st.cache_data(show_spinner=False)
+def choropleth_geojson(
+    year_range: Tuple[int, int],
+    include_intentional: bool,
+    include_unintentional: bool,
+    _agg: pd.DataFrame,
+    _info_by_province: Dict[str, Dict],
+    _geojson: Mapping,
+) -> Optional[Tuple[Dict, Tuple[float, float]]]:
+    # Returns the geojson with the map properties and the (min, max) range of
+    # the colour scale
+    if _agg.empty:
+        return None
 
-from config import MAP_BOUNDS, MAP_CENTER, PROVINCE_NAME_MAP
+    values = _agg["total_resources"]
+    value_range = (float(values.min()), float(values.max()))
+    min_v, max_v = value_range
+    if max_v <= min_v:
+        max_v = min_v + 1.0
 
+    colormap = linear.YlOrRd_09.scale(min_v, max_v)
 
-def normalize_province_names(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out["province_normalized"] = out["province"].map(PROVINCE_NAME_MAP).fillna(out["province"])
-    return out
+    # Only the properties are rewritten; geometries are shared with the
+    # cached geojson instead of deep-copying every coordinate.
+    features = []
+    for feature in _geojson.get("features", []):
+        props = dict(feature.get("properties", {}))
+        info = _info_by_province.get(props.get("name"), {})
+        props["total_resources"] = int(info.get("total_resources", 0))
+        props["num_personnel"] = int(info.get("num_personnel", 0))
+        props["num_heavy"] = int(info.get("num_heavy", 0))
+        props["num_air"] = int(info.get("num_air", 0))
+        props["burned_area"] = round(float(info.get("burned_area", 0)), 1)
 
+        v = props["total_resources"]
+        if v:
+            props["fill_color"] = list(colormap.rgb_bytes_tuple(v))
+        else:
+            props["fill_color"] = NO_DATA_COLOR
+        features.append({**feature, "properties": props})
 
-def create_choropleth_map(df: pd.DataFrame, geojson: Dict) -> Optional[folium.Map]:
-    if df.empty:
-        return None
+    return {**_geojson, "features": features}, value_range
 
-    df_norm = normalize_province_names(df)
 
-    agg = (
-        df_norm.groupby("province_normalized", as_index=False)
-        .agg(
-            num_personnel=("num_personnel", "sum"),
-            num_heavy=("num_heavy", "sum"),
-            num_air=("num_air", "sum"),
-            burned_area=("burned_area", "sum"),
-        )
-    )
-    agg["total_resources"] = agg[["num_personnel", "num_heavy", "num_air"]].sum(axis=1)
+class CompactDeck(pdk.Deck):
+    # st.pydeck_chart sends to_json() as-is, and pydeck pretty-prints it with
+    # indent=2, which puts every coordinate on its own line. The spec is
+    # serialized once and reused on every rerun that shows this Deck.
+    _spec: Optional[str] = None
 
-    lookup = agg.set_index("province_normalized").to_dict(orient="index")
+    def to_json(self) -> str:
+        if self._spec is None:
+            self._spec = json.dumps(
+                self, sort_keys=True, default=default_serialize, separators=(",", ":")
+            )
+        return self._spec
 
-    geo = copy.deepcopy(geojson)
-    for feature in geo.get("features", []):
-        name = feature.get("properties", {}).get("name")
-        info = lookup.get(name, {})
-        props = feature.setdefault("properties", {})
-        props["total_resources"] = int(info.get("total_resources", 0))
-        props["num_personnel"] = int(info.get("num_personnel", 0))
-        props["num_heavy"] = int(info.get("num_heavy", 0))
-        props["num_air"] = int(info.get("num_air", 0))
-        props["burned_area"] = float(info.get("burned_area", 0))
 
-    values = agg["total_resources"]
-    min_v = float(values.min()) if not values.empty else 0.0
-    max_v = float(values.max()) if not values.empty else 1.0
-    if max_v <= min_v:
-        max_v = min_v + 1.0
+def create_choropleth_map(geo: Dict) -> pdk.Deck:
+    (south, west), (north, east) = MAP_BOUNDS
 
-    colormap = linear.YlOrRd_09.scale(min_v, max_v)
-    colormap.caption = "Total resources"
-
-    def style_function(feature):
-        v = feature.get("properties", {}).get("total_resources", 0)
-        return {
-            "fillColor": colormap(v) if v else "#f2f2f2",
-            "color": "#333333",
-            "weight": 0.6,
-            "fillOpacity": 0.75,
-        }
-
-    m = folium.Map(location=MAP_CENTER, zoom_start=6, control_scale=True)
-    Fullscreen(
-        position="bottomright",
-        title="Full screen",
-        title_cancel="Exit Full Screen",
-    ).add_to(m)
-
-    m.fit_bounds(MAP_BOUNDS)
-
-    folium.GeoJson(
+    layer = pdk.Layer(
+        "GeoJsonLayer",
         geo,
-        name="Provinces",
-        style_function=style_function,
-        highlight_function=lambda _: {
-            "weight": 2,
-            "color": "#000000",
-            "fillOpacity": 0.9,
-        },
-        tooltip=GeoJsonTooltip(
-            fields=[
-                "name",
-                "total_resources",
-                "num_personnel",
-                "num_heavy",
-                "num_air",
-                "burned_area",
-            ],
-            aliases=[
-                "Province:",
-                "Total resources:",
-                "Personnel:",
-                "Heavy:",
-                "Air:",
-                "Burned area (ha):",
-            ],
-            localize=True,
-            sticky=True,
-            labels=True,
-        ),
-    ).add_to(m)
-
-    colormap.add_to(m)
-    return m
\ No newline at end of file
+        pickable=True,
+        stroked=True,
+        filled=True,
+        opacity=FILL_OPACITY,
+        get_fill_color="properties.fill_color",
+        get_line_color=[51, 51, 51],
+        line_width_min_pixels=0.6,
+        auto_highlight=True,
+        highlight_color=[0, 0, 0, 60],
+    )
+    view = pdk.ViewState(
+        latitude=(south + north) / 2,
+        longitude=(west + east) / 2,
+        zoom=4.6,
+    )
+    return CompactDeck(
+        layers=[layer],
+        initial_view_state=view,
+        map_style="light",
+        tooltip={"html": TOOLTIP_HTML},
+    )
+
+
+def session_choropleth(
+    year_range: Tuple[int, int],
+    include_intentional: bool,
+    include_unintentional: bool,
+    filtered: pd.DataFrame,
+    geojson: Mapping,
+) -> Tuple[Optional[pdk.Deck], Optional[Tuple[float, float]]]:
+    # Returns the map and the range of its colour scale. Reruns triggered by
+    # other widgets reuse this session's Deck and its serialized spec instead
+    # of unpickling the cached aggregation and geojson and serializing again.
+    key = (tuple(year_range), include_intentional, include_unintentional)
+    if st.session_state.get("choropleth_key") != key:
+        agg, info_by_province = province_resources(
+            filtered, year_range, include_intentional, include_unintentional
+        )
+        result = choropleth_geojson(
+            year_range,
+            include_intentional,
+            include_unintentional,
+            agg,
+            info_by_province,
+            geojson,
+        )
+        if result is None:
+            st.session_state["choropleth"] = (None, None)
+        else:
+            geo, value_range = result
+            st.session_state["choropleth"] = (create_choropleth_map(geo), value_range)
+        st.session_state["choropleth_key"] = key
+    return st.session_state["choropleth"]
@@ -0,0 +1,75 @@
+"""One-off preprocessing of the province boundaries served by the map.
+
+Rounds coordinates to 4 decimals (~11 m), drops the consecutive points
+that collapse onto each other after rounding and keeps only the
+properties the dashboard reads. Run it whenever spain-provinces.geojson
+changes:
+
+    python simplify_geojson.py
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List
+
+KEEP_PROPERTIES = ("name", "cod_prov")
+
+
+def simplify_ring(ring: List[List[float]], precision: int) -> List[List[float]]:
+    out: List[List[float]] = []
+    for x, y in ring:
+        point = [round(x, precision), round(y, precision)]
+        if not out or point != out[-1]:
+            out.append(point)
+    # A closed linear ring needs at least four positions
+    if len(out) < 4:
+        return [[round(x, precision), round(y, precision)] for x, y in ring]
+    return out
+
+
+def simplify_geometry(geometry: Dict, precision: int) -> Dict:
+    gtype = geometry["type"]
+    coords = geometry["coordinates"]
+    if gtype == "Polygon":
+        coords = [simplify_ring(ring, precision) for ring in coords]
+    elif gtype == "MultiPolygon":
+        coords = [[simplify_ring(ring, precision) for ring in poly] for poly in coords]
+    return {"type": gtype, "coordinates": coords}
+
+
+def simplify_geojson(geojson: Dict, precision: int = 4) -> Dict:
+    features = []
+    for feature in geojson.get("features", []):
+        props = feature.get("properties", {})
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": simplify_geometry(feature["geometry"], precision),
+                "properties": {k: props[k] for k in KEEP_PROPERTIES if k in props},
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", nargs="?", default="spain-provinces.geojson")
+    parser.add_argument("target", nargs="?", default="spain-provinces.min.geojson")
+    parser.add_argument("--precision", type=int, default=4)
+    args = parser.parse_args()
+
+    with open(args.source, "r", encoding="utf-8") as f:
+        geojson = json.load(f)
+
+    simplified = simplify_geojson(geojson, precision=args.precision)
+
+    with open(args.target, "w", encoding="utf-8") as f:
+        json.dump(simplified, f, ensure_ascii=False, separators=(",", ":"))
+
+    before = Path(args.source).stat().st_size
+    after = Path(args.target).stat().st_size
+    print(f"{args.source}: {before:,} bytes -> {args.target}: {after:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,9 @@
 import streamlit as st
 
-from aggregations import (
-    yearly_burned,
-    yearly_resources,
-    top_provinces_by_burned_area,
-)
-from data import load_data, load_geojson
+from aggregations import chart_summaries
+from data import load_cube, load_geojson
 from filters import filter_data
+from map_utils import session_choropleth
 from ui import sidebar_controls, main_panel
 
 
@@ -20,7 +17,7 @@ st.set_page_config(
 
 def main() -> None:
     try:
-        data = load_data()
+        cube = load_cube()
     except FileNotFoundError as e:
         st.error(str(e))
         st.stop()
@@ -31,8 +28,10 @@ def main() -> None:
         st.error(str(e))
         st.stop()
 
-    year_range, include_intentional, include_unintentional = sidebar_controls(data)
-    filtered = filter_data(data, year_range, include_intentional, include_unintentional)
+    year_range, include_intentional, include_unintentional = sidebar_controls(
+        cube.index.get_level_values("year")
+    )
+    filtered = filter_data(cube, year_range, include_intentional, include_unintentional)
 
     st.title("Forest Fires in Spain")
 
@@ -40,16 +39,19 @@ def main() -> None:
         st.warning("No data available for the selected filters.")
         return
 
-    burned_by_year = yearly_burned(filtered)
-    resources_by_year = yearly_resources(filtered)
-    top_provinces = top_provinces_by_burned_area(filtered, top_n=10)
+    summaries = chart_summaries(
+        filtered, year_range, include_intentional, include_unintentional, top_n=10
+    )
+    choropleth, resource_range = session_choropleth(
+        year_range, include_intentional, include_unintentional, filtered, geojson
+    )
 
     main_panel(
-        filtered,
-        geojson,
-        burned_by_year,
-        resources_by_year,
-        top_provinces,
+        choropleth,
+        resource_range,
+        summaries["burned_by_year"],
+        summaries["resources_by_year"],
+        summaries["top_provinces"],
     )
 
 
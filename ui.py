@@ -1,21 +1,20 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 import pandas as pd
+import pydeck as pdk
 import streamlit as st
-from streamlit_folium import st_folium
 
 from charts import (
     create_line_chart,
     create_stacked_bar,
     create_top_provinces_chart,
 )
-from map_utils import create_choropleth_map
 
 
-def sidebar_controls(df: pd.DataFrame) -> Tuple[Tuple[int, int], bool, bool]:
+def sidebar_controls(years: pd.Index) -> Tuple[Tuple[int, int], bool, bool]:
     st.sidebar.title("Interaction controls")
 
-    valid_years = df["year"].dropna()
+    valid_years = years.dropna()
     min_year = int(valid_years.min()) if not valid_years.empty else 2000
     max_year = int(valid_years.max()) if not valid_years.empty else 2020
 
@@ -55,8 +54,8 @@ def info_expander() -> None:
 
 
 def main_panel(
-    df: pd.DataFrame,
-    geojson: dict,
+    choropleth: Optional[pdk.Deck],
+    resource_range: Optional[Tuple[float, float]],
     burned_by_year: pd.DataFrame,
     resources_by_year: pd.DataFrame,
     top_provinces: pd.DataFrame,
@@ -65,9 +64,13 @@ def main_panel(
 
     with col1:
         st.markdown("### Response resources by province")
-        fmap = create_choropleth_map(df, geojson)
-        if fmap:
-            st_folium(fmap, width=700, height=500)
+        if choropleth is not None:
+            st.pydeck_chart(choropleth, height=500)
+            min_v, max_v = resource_range
+            st.caption(
+                f"Colour scale: total resources deployed, from yellow ({min_v:,.0f}) "
+                f"to red ({max_v:,.0f})."
+            )
 
         st.markdown("### Burned area trend")
         fig_line = create_line_chart(burned_by_year)